@@ -64,7 +64,7 @@ setup(
         "Topic :: Utilities",
     ],
     keywords=["Sparse", "Synthetic", "Controls"],
-    install_requires=["numpy", "Scipy", "scikit-learn", "pandas", "pyyaml"],
+    install_requires=["numpy", "Scipy", "scikit-learn", "joblib", "threadpoolctl", "pandas", "pyyaml"],
     entry_points={
         "console_scripts": [
             "scgrad=SparseSC.cli.scgrad:main",
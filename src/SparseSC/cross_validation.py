@@ -4,12 +4,17 @@ Implements the cross-fold Validation and parallelization methods
 
 from os.path import join
 import atexit
+import itertools
 import numpy as np
 from concurrent import futures
+from joblib import Parallel, delayed, effective_n_jobs
+from threadpoolctl import threadpool_limits
 
 from SparseSC.fit_fold import fold_v_matrix
 from SparseSC.fit_loo import loo_v_matrix
 from SparseSC.fit_ct import ct_v_matrix, ct_score
+from SparseSC.tensor import tensor
+from SparseSC.utils.misc import _as_float
 
 
 def score_train_test(
@@ -58,7 +63,9 @@ def score_train_test(
     :param progress: Should progress messages be printed to the console?
     :type progress: boolean
 
-    :param kwargs: additional arguments passed to the underlying matrix method
+    :param kwargs: additional arguments passed to the underlying matrix method,
+        including ``compute_dtype``: the inputs are coerced to float64 unless
+        it is ``numpy.float32``
 
     :raises ValueError: when X, Y, X_treat, or Y_treat are not coercible to a
        :class:`numpy.float64` or have incompatible dimensions
@@ -81,11 +88,11 @@ def score_train_test(
 
         # PARAMETER QC
         try:
-            X = np.float64(X)
+            X = _as_float(X, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("X is not coercible to numpy float64")
         try:
-            Y = np.float64(Y)
+            Y = _as_float(Y, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("Y is not coercible to numpy float64")
 
@@ -275,6 +282,33 @@ def score_train_test_sorted_v_pens(
     return list(zip(*values))
 
 
+def _score_folds(score, train_test_splits, parallel_folds=False, n_jobs=None, **kwargs):
+    """ Calls ``score`` for each (train, test) split, sequentially or, with
+    ``parallel_folds`` and more than one effective job, in a pool of
+    ``n_jobs`` threads.  Results are returned in fold order.
+
+    While the folds run in threads, BLAS is limited to a single thread per
+    fold (unlike loky, joblib's threading backend does not cap the inner
+    threads); sequential folds keep the full BLAS thread pool.  Folds are never threaded with a ``batch_client_config``, as
+    each fold's gradient daemon / batch client would share the same FIFOs.
+    """
+    if (
+        parallel_folds
+        and len(train_test_splits) > 1
+        and kwargs.get("batch_client_config") is None
+        and effective_n_jobs(n_jobs) > 1
+    ):
+        with threadpool_limits(limits=1):
+            return Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(score)(train=train, test=test, FoldNumber=fold, **kwargs)
+                for fold, (train, test) in enumerate(train_test_splits)
+            )
+    return [
+        score(train=train, test=test, FoldNumber=fold, **kwargs)
+        for fold, (train, test) in enumerate(train_test_splits)
+    ]
+
+
 def CV_score(
     X,
     Y,
@@ -292,19 +326,38 @@ def CV_score(
     # this is here for API consistency:
     progress=None,  # pylint: disable=unused-argument
     w_pen_inner=False,
+    return_vs=False,
+    parallel_folds=False,
+    n_jobs=None,
     **kwargs
 ):
     """ 
     Cross fold validation for 1 or more v Penalties, holding the w penalty fixed.
+
+    If ``return_vs`` is ``True``, the tensor matrix (V) is also fit on the
+    full training set for each penalty, and is returned as a third value (a
+    list aligned with the iterable penalty, or a single matrix).  When
+    ``cache`` is set, each of these fits starts from the V of the previous
+    penalty.
+
+    If ``parallel_folds`` is ``True`` (and ``parallel`` is not), the folds are
+    scored concurrently in ``n_jobs`` threads which share ``X`` and ``Y``; the
+    work is dominated by NumPy / BLAS calls which release the GIL.  Callers
+    which already run several ``CV_score``'s in parallel should leave this
+    off to avoid oversubscribing the cores.
+
+    The data are coerced to float64, unless ``compute_dtype=numpy.float32``
+    is passed in ``kwargs``, in which case the folds are fit in single
+    precision.
     """
 
     # PARAMETER QC
     try:
-        X = np.float64(X)
+        X = _as_float(X, kwargs.get("compute_dtype"))
     except ValueError:
         raise ValueError("X is not coercible to float64")
     try:
-        Y = np.float64(Y)
+        Y = _as_float(Y, kwargs.get("compute_dtype"))
     except ValueError:
         raise ValueError("X is not coercible to float64")
 
@@ -349,11 +402,11 @@ def CV_score(
 
         # PARAMETER QC
         try:
-            X_treat = np.float64(X_treat)
+            X_treat = _as_float(X_treat, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("X_treat is not coercible to float64")
         try:
-            Y_treat = np.float64(Y_treat)
+            Y_treat = _as_float(Y_treat, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("Y_treat is not coercible to float64")
 
@@ -465,23 +518,21 @@ def CV_score(
 
         else:
 
-            results = [
-                __score_train_test__(
-                    X=X,
-                    Y=Y,
-                    X_treat=X_treat,
-                    Y_treat=Y_treat,
-                    v_pen=v_pen,
-                    w_pen=w_pen,
-                    train=train,
-                    test=test,
-                    FoldNumber=fold,
-                    progress=progress,
-                    w_pen_inner=w_pen_inner,
-                    **kwargs
-                )
-                for fold, (train, test) in enumerate(train_test_splits)
-            ]
+            results = _score_folds(
+                __score_train_test__,
+                train_test_splits,
+                parallel_folds,
+                n_jobs,
+                X=X,
+                Y=Y,
+                X_treat=X_treat,
+                Y_treat=Y_treat,
+                v_pen=v_pen,
+                w_pen=w_pen,
+                progress=progress,
+                w_pen_inner=w_pen_inner,
+                **kwargs
+            )
 
     else:  # X_treat *is* None
 
@@ -577,21 +628,19 @@ def CV_score(
                 _clean_up_worker_pool()
 
         else:
-            results = [
-                __score_train_test__(
-                    X=X,
-                    Y=Y,
-                    v_pen=v_pen,
-                    w_pen=w_pen,
-                    train=train,
-                    test=test,
-                    FoldNumber=fold,
-                    progress=progress,
-                    w_pen_inner=w_pen_inner,
-                    **kwargs
-                )
-                for fold, (train, test) in enumerate(train_test_splits)
-            ]
+            results = _score_folds(
+                __score_train_test__,
+                train_test_splits,
+                parallel_folds,
+                n_jobs,
+                X=X,
+                Y=Y,
+                v_pen=v_pen,
+                w_pen=w_pen,
+                progress=progress,
+                w_pen_inner=w_pen_inner,
+                **kwargs
+            )
 
     # extract the score.
     _, _, scores = list(zip(*results))
@@ -610,7 +659,45 @@ def CV_score(
         total_score = sum(scores)
         se = np.sqrt(len(scores)) * np.std(scores)
 
-    return total_score, se
+    if not return_vs:
+        return total_score, se
+
+    # FIT V ON THE FULL TRAINING SET FOR EACH PENALTY
+    cache = kwargs.pop("cache", False)
+    start = kwargs.pop("start", None)
+    if v_pen_is_iterable or w_pen_is_iterable:
+        v_mats = []
+        for _v_pen, _w_pen in zip(
+            v_pen if v_pen_is_iterable else itertools.repeat(v_pen),
+            w_pen if w_pen_is_iterable else itertools.repeat(w_pen),
+        ):
+            v_mats.append(
+                tensor(
+                    X=X,
+                    Y=Y,
+                    X_treat=X_treat,
+                    Y_treat=Y_treat,
+                    v_pen=_v_pen,
+                    w_pen=_w_pen,
+                    start=start,
+                    **kwargs
+                )
+            )
+            if cache:
+                start = np.diag(v_mats[-1])
+    else:
+        v_mats = tensor(
+            X=X,
+            Y=Y,
+            X_treat=X_treat,
+            Y_treat=Y_treat,
+            v_pen=v_pen,
+            w_pen=w_pen,
+            start=start,
+            **kwargs
+        )
+
+    return total_score, se, v_mats
 
 # ------------------------------------------------------------
 # utilities for maintaining a worker pool
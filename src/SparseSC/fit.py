@@ -2,18 +2,32 @@
 
 Implements round-robin fitting of Sparse Synthetic Controls Model for DGP based analysis
 """
-from os.path import join
+from os import environ
+from os.path import join, expanduser
 from warnings import warn
 from inspect import signature
+from functools import lru_cache
 import numpy as np
+from joblib import Memory, Parallel, delayed
 from sklearn.metrics import r2_score
 
-from .utils.penalty_utils import get_max_w_pen, get_max_v_pen, w_pen_guestimate
+from .utils.penalty_utils import (
+    get_max_w_pen,
+    get_max_v_pen,
+    w_pen_guestimate,
+    _cached_get_max_v_pen,
+    _cached_w_pen_guestimate,
+)
 from .cross_validation import CV_score
 from .tensor import tensor
 from .weights import weights
 from .utils.warnings import SparseSCWarning
-from .utils.misc import _ensure_good_donor_pool, _get_fit_units
+from .utils.misc import (
+    _ensure_good_donor_pool,
+    _get_fit_units,
+    _take_rows,
+    _check_compute_dtype,
+)
 
 # pylint: disable=too-many-lines, inconsistent-return-statements, fixme
 
@@ -50,6 +64,7 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
     gradient_folds=10,
     w_pen_inner=False,
     match_space_maker=None,
+    cache_penalties=True,
     **kwargs
 ):
     r"""
@@ -81,7 +96,7 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
     :type v_pen: float | float[], optional
 
     :param grid: only used when `v_pen` is not provided.
-        Defaults to ``np.exp(np.linspace(np.log(grid_min),np.log(grid_max),grid_length))``
+        Defaults to ``np.geomspace(grid_min, grid_max, grid_length)``
     :type grid: float | float[], optional
 
     :param grid_min: Lower bound for ``grid`` when
@@ -110,6 +125,12 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
         if the coordinate descent should stop.
     :type stopping_rule: int, float, or function
 
+    :param cache_penalties: If ``True``, the default ``w_pen`` and the
+        maximum ``v_pen`` are memoized on the contents of the features and
+        targets, so repeated calls to ``fit`` with the same data do not
+        recompute them.  Only used when ``gradient_folds`` is an integer.
+    :type cache_penalties: boolean, default = ``True``
+
     :param choice: Method for choosing from among the
         v_pen.  Only used when v_pen is an
         iterable.  Defaults to ``"min"`` which selects the v_pen parameter
@@ -145,6 +166,64 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
         messages indication the progress are printed to the console (stdout).
     :type progress: boolean, default = ``True``
 
+    :param n_jobs: Number of processes used to score the points of the
+        penalty grid in parallel (passed to :class:`joblib.Parallel`). Use
+        ``1`` to score the grid sequentially.
+    :type n_jobs: int, default = -1
+
+    :param fold_parallel: If ``True``, whenever the penalties are scored
+        sequentially (a single penalty, ``early_stop`` or ``warm_start``),
+        the cross validation folds are scored concurrently in ``n_jobs``
+        threads sharing the data (each using a single BLAS thread).  Ignored
+        with ``parallel`` or ``batch_client_config``.
+    :type fold_parallel: boolean, default = ``True``
+
+    :param early_stop: If provided, the penalty grid is scored sequentially
+        from the largest penalty to the smallest, and scoring stops once
+        ``patience`` consecutive grid points score worse than the best score
+        so far by more than ``tol``.  Either an integer ``patience`` or a
+        tuple ``(patience, tol)`` (``tol`` defaults to 0).  Grid points which
+        are not scored are assigned a score of ``inf``.  Not supported with
+        ``w_pen_inner``.
+    :type early_stop: int or (int, float), optional
+
+    :param warm_start: If ``True``, the penalty grid is scored sequentially
+        from the largest penalty to the smallest, V is fit for each penalty,
+        and each fit starts from the V fit at the previous penalty. The V
+        fit at the chosen penalty is reused instead of being refit.  Not
+        supported with ``w_pen_inner``.
+    :type warm_start: boolean, default = ``False``
+
+    :param recompute_final: If ``True``, V is refit at the chosen penalty
+        even when it was already fit while scoring the grid (see
+        ``warm_start``).
+    :type recompute_final: boolean, default = ``False``
+
+    :param cache_dir: Directory in which the cross validation scores are
+        cached (via :class:`joblib.Memory`), so that repeated fits with the
+        same data, penalties, folds and seeds are read from disk instead of
+        recomputed (within a sub-directory per SparseSC version).  Defaults to
+        the ``SPARSESC_CACHE`` environment variable; when neither is set (or
+        ``cache_dir=False``), nothing is cached.
+    :type cache_dir: str, optional
+
+    :param compute_dtype: Floating point type used while selecting the
+        penalties and fitting V.  Passing ``numpy.float32`` roughly halves the
+        memory traffic of those (dominant) steps.  The final unit weights,
+        the returned V, and the scores stored on the fit remain ``float64``.
+        Defaults to ``None`` (float64 throughout).  Any other value raises a
+        ``ValueError``.
+    :type compute_dtype: numpy.float32, optional
+
+    :param compute_control_weights: If ``False``, the synthetic control
+        weights of the control units (an N0 x N0 problem that dominates the
+        final step when there are many controls) are not computed.  Their rows
+        of ``sc_weights`` are ``NaN`` and they are listed in the fit's
+        ``unweighted_units``; :meth:`SparseSCFit.predict` returns their own
+        outcomes, and they are left out of ``score_R2``.  Ignored for
+        ``model_type="full"``.
+    :type compute_control_weights: boolean, default = ``True``
+
     :param kwargs: Additional arguments passed to the optimizer (i.e.
         ``method`` or `scipy.optimize.minimize`).  See below.
 
@@ -244,7 +323,9 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
         return _fit(X, Y, treated_units, w_pen, v_pen, gradient_folds=gradient_folds,**kwargs)
     
     if treated_units is not None:
-        control_units = [u for u in range(Y.shape[0]) if u not in treated_units]
+        control_mask = np.ones(Y.shape[0], dtype=bool)
+        control_mask[np.asarray(list(treated_units), dtype=np.intp)] = False
+        control_units = np.flatnonzero(control_mask).tolist()
 
     # --------------------------------------------------
     # Solve null-model case
@@ -292,12 +373,12 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
         X_v = X[fit_units, :]
         Y_v = Y[fit_units,:]
         def _fit_model_wrapper(MatchSpace, V): #disregard V
-            return fit(MatchSpace.transform(X), Y, treated_units, w_pen, v_pen, grid, grid_min, grid_max, grid_length, stopping_rule, gradient_folds, w_pen_inner, **kwargs)
+            return fit(MatchSpace.transform(X), Y, treated_units, w_pen, v_pen, grid, grid_min, grid_max, grid_length, stopping_rule, gradient_folds, w_pen_inner, cache_penalties=cache_penalties, **kwargs)
         MatchSpace, _, _, MatchSpaceDesc = match_space_maker(X_v, Y_v, fit_model_wrapper=_fit_model_wrapper) #drop V, best_v_pen
 
         M = MatchSpace.transform(X)
 
-        fit_inner = fit(M, Y, treated_units, w_pen, v_pen, grid, grid_min, grid_max, grid_length, stopping_rule, gradient_folds, w_pen_inner, **kwargs)
+        fit_inner = fit(M, Y, treated_units, w_pen, v_pen, grid, grid_min, grid_max, grid_length, stopping_rule, gradient_folds, w_pen_inner, cache_penalties=cache_penalties, **kwargs)
         #fix-up
         fit_inner.match_space = M
         fit_inner.features = X
@@ -309,7 +390,7 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
     # BUILD THE COORDINATE DESCENT PARAMETERS
     # --------------------------------------------------
     if grid is None:
-        grid = np.exp(np.linspace(np.log(grid_min), np.log(grid_max), grid_length))
+        grid = np.geomspace(grid_min, grid_max, grid_length)
 
     if treated_units is not None:
         _X, _Y = X[control_units, :], Y[control_units, :]
@@ -369,7 +450,14 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
     while True:
 
         v_pen, w_pen, axis = _build_penalties(
-            _X, _Y, v_pen, w_pen, grid, gradient_folds, verbose=kwargs.get("verbose", 1)
+            _X,
+            _Y,
+            v_pen,
+            w_pen,
+            grid,
+            gradient_folds,
+            verbose=kwargs.get("verbose", 1),
+            cache=cache_penalties,
         )
         if last_axis:
             assert axis != last_axis
@@ -402,15 +490,21 @@ def fit(  # pylint: disable=differing-type-doc, differing-param-doc
     return model_fit
 
 
-def _build_penalties(X, Y, v_pen, w_pen, grid, gradient_folds, verbose):
+def _build_penalties(X, Y, v_pen, w_pen, grid, gradient_folds, verbose, cache=True):
     """ Build (sensible?) defaults for the v_pen and w_pen
     """
+    if cache and (gradient_folds is None or isinstance(gradient_folds, int)):
+        _w_pen_guestimate = _cached_w_pen_guestimate
+        _get_max_v_pen = _cached_get_max_v_pen
+    else:
+        _w_pen_guestimate = w_pen_guestimate
+        _get_max_v_pen = get_max_v_pen
 
     if w_pen is None:
         if v_pen is None:
             # use the guestimate for w_pen and generate a grid based sequence for v_pen
-            w_pen = w_pen_guestimate(X)
-            v_pen_max = get_max_v_pen(
+            w_pen = _w_pen_guestimate(X)
+            v_pen_max = _get_max_v_pen(
                 X, Y, w_pen=w_pen, grad_splits=gradient_folds, verbose=verbose
             )
             axis = "v_pen"
@@ -425,7 +519,7 @@ def _build_penalties(X, Y, v_pen, w_pen, grid, gradient_folds, verbose):
 
     else:  # w_pen is not None:
 
-        v_pen_max = get_max_v_pen(
+        v_pen_max = _get_max_v_pen(
             X, Y, w_pen=w_pen, grad_splits=gradient_folds, verbose=verbose
         )
         axis = "v_pen"
@@ -434,6 +528,196 @@ def _build_penalties(X, Y, v_pen, w_pen, grid, gradient_folds, verbose):
     return v_pen, w_pen, axis
 
 
+def _cv_scorer(cache_dir=None):
+    """ Returns :func:`CV_score`, memoized on disk in ``cache_dir`` (or the
+    ``SPARSESC_CACHE`` environment variable) when either is set
+
+    :class:`joblib.Memory` only tracks the source of ``CV_score`` itself, so
+    the scores are kept in a sub-directory per SparseSC version, and are not
+    reused after an upgrade changes the functions it calls.
+    """
+    from . import __version__
+
+    if cache_dir is None:
+        cache_dir = environ.get("SPARSESC_CACHE")
+    if not cache_dir:
+        return CV_score
+    return Memory(join(expanduser(cache_dir), __version__), verbose=0).cache(
+        CV_score,
+        ignore=["quiet", "progress", "parallel", "max_workers", "parallel_folds", "n_jobs"],
+    )
+
+
+def _cv_grid(
+    v_pen,
+    w_pen,
+    n_jobs=-1,
+    early_stop=None,
+    warm_start=False,
+    cache_dir=None,
+    fold_parallel=True,
+    **kwargs
+):
+    """ Cross validation scores for each point in the grid of penalties
+
+    Dispatches one :func:`CV_score` call per penalty so that the (independent)
+    grid points are scored in parallel. Falls back to a single call when
+    neither penalty is an iterable, when a batch file is being produced, when
+    the grid points are not independent (``cache`` starts each fit from the
+    previous solution, and ``w_pen_inner`` from the previous ``w_pen``), or
+    when the folds are already distributed by ``CV_score`` itself
+    (``parallel`` or ``batch_client_config``).
+
+    When ``early_stop`` or ``warm_start`` are provided, the grid is instead
+    scored sequentially by :func:`_cv_path`.
+
+    Unless a batch file is being produced, the calls to :func:`CV_score` are
+    cached on disk as described in :func:`_cv_scorer`.
+
+    With ``fold_parallel``, the sequential calls (a single call or the
+    :func:`_cv_path`) score the cross validation folds in ``n_jobs`` threads.
+    The parallel dispatch over the grid scores the folds sequentially, as
+    the grid points already occupy the cores.
+
+    Returns a tuple of the scores, their standard errors, and the V matrix
+    fit for each grid point (``None`` unless ``warm_start`` is set), or
+    ``None`` when only a batch file is produced.
+    """
+    v_pen_is_iterable = False
+    try:
+        iter(v_pen)
+    except TypeError:
+        pass
+    else:
+        v_pen_is_iterable = True
+
+    w_pen_is_iterable = False
+    try:
+        iter(w_pen)
+    except TypeError:
+        pass
+    else:
+        w_pen_is_iterable = True
+
+    if kwargs.get("batchDir") is not None:
+        cv_score = CV_score
+    else:
+        cv_score = _cv_scorer(cache_dir)
+
+    if (
+        not (v_pen_is_iterable or w_pen_is_iterable)
+        or kwargs.get("batchDir") is not None
+        or kwargs.get("cache")
+        or kwargs.get("w_pen_inner")
+    ):
+        ret = cv_score(
+            v_pen=v_pen,
+            w_pen=w_pen,
+            parallel_folds=fold_parallel,
+            n_jobs=n_jobs,
+            **kwargs
+        )
+        if not ret:
+            # this happens when only a batch file is being produced but not executed
+            return
+        scores, scores_se = ret
+        return scores, scores_se, None
+    kwargs.pop("cache", None)
+
+    if v_pen_is_iterable:
+        grid = [{"v_pen": _v_pen, "w_pen": w_pen} for _v_pen in v_pen]
+        pens = v_pen
+    else:
+        grid = [{"v_pen": v_pen, "w_pen": _w_pen} for _w_pen in w_pen]
+        pens = w_pen
+
+    if early_stop is not None or warm_start:
+        return _cv_path(
+            pens,
+            grid,
+            early_stop,
+            warm_start,
+            cv_score,
+            parallel_folds=fold_parallel,
+            n_jobs=n_jobs,
+            **kwargs
+        )
+
+    if kwargs.get("parallel") or kwargs.get("batch_client_config"):
+        # CV_score already farms the folds out to its own process pool (or to
+        # a gradient daemon / batch client listening on fixed FIFOs), so the
+        # grid is scored in a single call rather than one call per worker
+        scores, scores_se = cv_score(v_pen=v_pen, w_pen=w_pen, **kwargs)
+        return scores, scores_se, None
+
+    # only the first grid point prints the cross validation banner
+    quiet = kwargs.pop("quiet", False)
+    results = Parallel(n_jobs=n_jobs, backend="loky", batch_size="auto")(
+        delayed(cv_score)(
+            **penalties, parallel_folds=False, quiet=quiet or i > 0, **kwargs
+        )
+        for i, penalties in enumerate(grid)
+    )
+
+    scores, scores_se = zip(*results)
+    return np.array(scores), np.array(scores_se), None
+
+
+def _cv_path(
+    pens, grid, early_stop=None, warm_start=False, cv_score=CV_score, **kwargs
+):
+    """ Scores the grid of penalties sequentially, from the largest penalty to
+    the smallest.
+
+    ``early_stop`` is either the integer ``patience`` or a tuple ``(patience,
+    tol)``, and stops the search once ``patience`` consecutive scores exceed
+    the best score so far by more than ``tol``.  Grid points which are never
+    scored are given a score (and standard error) of ``inf`` so they are never
+    chosen.
+
+    When ``warm_start`` is set, :func:`CV_score` also fits V on the full
+    training set for each grid point, and each fit (including the cross
+    validation fits) starts from the previous grid point's V. The list of V
+    matrices is returned alongside the scores.
+    """
+    if early_stop is None:
+        patience, tol = None, 0
+    else:
+        try:
+            patience, tol = early_stop
+        except TypeError:
+            patience, tol = early_stop, 0
+
+    scores = np.full(len(grid), np.inf)
+    scores_se = np.full(len(grid), np.inf)
+    v_mats = [None] * len(grid) if warm_start else None
+
+    start = None
+    best_score = np.inf
+    since_improve = 0
+    for i in np.argsort(np.asarray(pens))[::-1]:
+        if warm_start:
+            scores[i], scores_se[i], v_mats[i] = cv_score(
+                start=start, return_vs=True, **grid[i], **kwargs
+            )
+            start = np.diag(v_mats[i])
+        else:
+            scores[i], scores_se[i] = cv_score(**grid[i], **kwargs)
+        # only the first grid point prints the cross validation banner
+        kwargs["quiet"] = True
+
+        if scores[i] < best_score:
+            best_score = scores[i]
+        if scores[i] - best_score > tol:
+            since_improve += 1
+            if patience is not None and since_improve >= patience:
+                break
+        else:
+            since_improve = 0
+
+    return scores, scores_se, v_mats
+
+
 def _fit(
     X,
     Y,
@@ -451,14 +735,35 @@ def _fit(
     progress=True,
     batchDir=None,
     w_pen_inner=False,
+    n_jobs=-1,
+    early_stop=None,
+    warm_start=False,
+    recompute_final=False,
+    cache_dir=None,
+    compute_dtype=None,
+    compute_control_weights=True,
+    fold_parallel=True,
     **kwargs
 ):
     assert X.shape[0] == Y.shape[0]
 
+    _check_compute_dtype(compute_dtype)
+    if compute_dtype is None:
+        _compute = lambda a: a
+    else:
+        # cast once here; CV_score and tensor keep float32 given compute_dtype
+        _compute = lambda a: np.asarray(a, dtype=np.float32)
+        kwargs["compute_dtype"] = compute_dtype
+
     if (not callable(choice)) and (choice not in ("min", "1se")):
         # Fail Faster (tm)
         raise ValueError("Unexpected value for choice parameter: %s" % choice)
 
+    if w_pen_inner and (early_stop is not None or warm_start):
+        # the w_pen re-estimated at each v_pen seeds the next v_pen, which
+        # _cv_path's one call per penalty cannot carry over
+        raise ValueError("early_stop and warm_start cannot be combined with w_pen_inner")
+
     w_pen_is_iterable = False
     try:
         iter(w_pen)
@@ -527,6 +832,23 @@ def _fit(
             return v_pen[indx], w_pen, scores[indx], indx
         return v_pen, w_pen, scores, None
 
+    # arguments to _fit_core() shared by all model types
+    core_args = dict(
+        v_pen=v_pen,
+        w_pen=w_pen,
+        choose=_choose,
+        cv_folds=cv_folds,
+        progress=progress,
+        batchDir=batchDir,
+        w_pen_inner=w_pen_inner,
+        n_jobs=n_jobs,
+        early_stop=early_stop,
+        warm_start=warm_start,
+        recompute_final=recompute_final,
+        cache_dir=cache_dir,
+        fold_parallel=fold_parallel,
+    )
+
     if treated_units is not None:
 
         # --------------------------------------------------
@@ -552,12 +874,17 @@ def _fit(
         assert all(unit < Y.shape[0] for unit in treated_units)
         assert all(unit >= 0 for unit in treated_units)
 
-        control_units = [u for u in range(Y.shape[0]) if u not in treated_units]
+        treated_units_arr = np.asarray(treated_units, dtype=np.intp)
+        control_mask = np.ones(Y.shape[0], dtype=bool)
+        control_mask[treated_units_arr] = False
+        control_units_arr = np.flatnonzero(control_mask)
+        control_units = control_units_arr.tolist()
 
-        Xtrain = X[control_units, :]
-        Xtest = X[treated_units, :]
-        Ytrain = Y[control_units, :]
-        Ytest = Y[treated_units, :]
+        # slice views when the units are contiguous blocks -- not to be written to
+        Xtrain = _take_rows(X, control_units_arr)
+        Xtest = _take_rows(X, treated_units_arr)
+        Ytrain = _take_rows(Y, control_units_arr)
+        Ytest = _take_rows(Y, treated_units_arr)
 
         # --------------------------------------------------
         # Actual work
@@ -566,42 +893,13 @@ def _fit(
         if model_type == "retrospective":
             # Retrospective Treatment Effects:  ( *model_type = "prospective"*)
 
-            # --------------------------------------------------
-            # Phase 1: extract cross fold residual errors for each v_pen
-            # --------------------------------------------------
-
-            # SCORES FOR EACH VALUE OF THE GRID: very slow ( minutes to hours )
-            ret = CV_score(
-                X=Xtrain,
-                Y=Ytrain,
-                splits=cv_folds,
-                v_pen=v_pen,
-                w_pen=w_pen,
-                progress=progress,
-                grad_splits=gradient_folds,
-                random_state=gradient_seed,  # TODO: Cleanup Task 1
-                quiet=not progress,
-                batchDir=batchDir,
-                w_pen_inner=w_pen_inner,
-                **kwargs
-            )
-            if not ret:
-                # this happens when only a batch file is being produced but not executed
-                return
-            scores, scores_se = ret
-
-            best_v_pen, best_w_pen, score, which = _choose(scores, scores_se)
-
-            # --------------------------------------------------
-            # Phase 2: extract V and weights: slow ( tens of seconds to minutes )
-            # --------------------------------------------------
-            best_V = tensor(
-                X=Xtrain,
-                Y=Ytrain,
-                w_pen=best_w_pen,
-                v_pen=best_v_pen,
+            # Phases 1 and 2 (penalty selection and V) run in compute_dtype
+            ret = _fit_core(
+                _compute(Xtrain),
+                _compute(Ytrain),
                 grad_splits=gradient_folds,
                 random_state=gradient_seed,  # TODO: Cleanup Task 1
+                **core_args,
                 **kwargs
             )
 
@@ -612,87 +910,38 @@ def _fit(
             try:
                 iter(gradient_folds)
             except TypeError:
-                from sklearn.model_selection import KFold
-
-                gradient_folds = KFold(
-                    gradient_folds, shuffle=True, random_state=gradient_seed
-                ).split(np.arange(X.shape[0]))
-                gradient_folds = [
-                    [
-                        list(set(train).union(treated_units)),
-                        list(set(test).difference(treated_units)),
-                    ]
-                    for train, test in gradient_folds
-                ]  # pylint: disable=line-too-long
-                gradient_folds = [
-                    [train, test]
-                    for train, test in gradient_folds
-                    if len(train) != 0 and len(test) != 0
-                ]  # pylint: disable=line-too-long
-                gradient_folds.append([control_units, treated_units])
+                gradient_folds = _shuffled_folds(
+                    X.shape[0], gradient_folds, gradient_seed
+                )
+                gradient_folds = _prospective_folds(
+                    gradient_folds, treated_units, control_units, X.shape[0]
+                )
             else:
                 # user supplied gradient folds
                 gradient_folds = list(gradient_folds)
-                treated_units_set = set(treated_units)
+                treated_sorted = np.sort(treated_units_arr)
+
+                def _is_treated_fold(test):
+                    test = np.asarray(test, dtype=np.intp)
+                    return test.size == treated_sorted.size and np.array_equal(
+                        np.sort(test), treated_sorted
+                    )
 
-                # TODO: this condition logic is untested:
-                if not any(treated_units_set == set(gf[1]) for gf in gradient_folds):
+                if not any(_is_treated_fold(gf[1]) for gf in gradient_folds):
                     warn(
                         "User supplied gradient_folds will be re-formed for compatibility with model_type 'prospective'",
                         SparseSCParameterWarning,
                     )  # pylint: disable=line-too-long
-                    gradient_folds = [
-                        [
-                            list(set(train).union(treated_units)),
-                            list(set(test).difference(treated_units)),
-                        ]
-                        for train, test in gradient_folds
-                    ]  # pylint: disable=line-too-long
-                    gradient_folds = [
-                        [train, test]
-                        for train, test in gradient_folds
-                        if len(train) != 0 and len(test) != 0
-                    ]  # pylint: disable=line-too-long
-                    gradient_folds.append([control_units, treated_units])
-
-            # --------------------------------------------------
-            # Phase 1: extract cross fold residual errors for each v_pen
-            # --------------------------------------------------
-
-            # SCORES FOR EACH VALUE OF THE GRID: very slow ( minutes to hours )
-            ret = CV_score(
-                X=X,
-                Y=Y,
-                splits=cv_folds,
-                v_pen=v_pen,
-                w_pen=w_pen,
-                progress=progress,
-                grad_splits=gradient_folds,
-                random_state=gradient_seed,  # TODO: Cleanup Task 1
-                quiet=not progress,
-                batchDir=batchDir,
-                w_pen_inner=w_pen_inner,
-                **kwargs
-            )
-            if not ret:
-                # this happens when only a batch file is being produced but not executed
-                return
-            scores, scores_se = ret
-
-            # GET THE INDEX OF THE BEST SCORE
-            best_v_pen, best_w_pen, score, which = _choose(scores, scores_se)
-
-            # --------------------------------------------------
-            # Phase 2: extract V and weights: slow ( tens of seconds to minutes )
-            # --------------------------------------------------
-
-            best_V = tensor(
-                X=X,
-                Y=Y,
-                w_pen=best_w_pen,
-                v_pen=best_v_pen,
+                    gradient_folds = _prospective_folds(
+                        gradient_folds, treated_units, control_units, X.shape[0]
+                    )
+
+            ret = _fit_core(
+                _compute(X),
+                _compute(Y),
                 grad_splits=gradient_folds,
                 random_state=gradient_seed,  # TODO: Cleanup Task 1
+                **core_args,
                 **kwargs
             )
 
@@ -702,44 +951,12 @@ def _fit(
             # chosen penalty parameters and V matrix also optimizes the
             # unobserved ( || Y_treat - W Y_ctrl || ) in counter factual
 
-            # --------------------------------------------------
-            # Phase 1: extract cross fold residual errors for each v_pen
-            # --------------------------------------------------
-
-            # SCORES FOR EACH VALUE OF THE GRID: very slow ( minutes to hours )
-            ret = CV_score(
-                X=Xtrain,
-                Y=Ytrain,
-                X_treat=Xtest,
-                Y_treat=Ytest,
-                splits=cv_folds,
-                v_pen=v_pen,
-                w_pen=w_pen,
-                progress=progress,
-                quiet=not progress,
-                batchDir=batchDir,
-                w_pen_inner=w_pen_inner,
-                **kwargs
-            )
-            if not ret:
-                # this happens when only a batch file is being produced but not executed
-                return
-            scores, scores_se = ret
-
-            # GET THE INDEX OF THE BEST SCORE
-            best_v_pen, best_w_pen, score, which = _choose(scores, scores_se)
-
-            # --------------------------------------------------
-            # Phase 2: extract V and weights: slow ( tens of seconds to minutes )
-            # --------------------------------------------------
-
-            best_V = tensor(
-                X=Xtrain,
-                Y=Ytrain,
-                X_treat=Xtest,
-                Y_treat=Ytest,
-                w_pen=best_w_pen,
-                v_pen=best_v_pen,
+            ret = _fit_core(
+                _compute(Xtrain),
+                _compute(Ytrain),
+                X_treat=_compute(Xtest),
+                Y_treat=_compute(Ytest),
+                **core_args,
                 **kwargs
             )
 
@@ -748,6 +965,11 @@ def _fit(
                 "unexpected model_type '%s' or treated_units = None" % model_type
             )
 
+        if not ret:
+            # this happens when only a batch file is being produced but not executed
+            return
+        best_V, best_v_pen, best_w_pen, score, scores, which = ret
+
         # GET THE BEST SET OF WEIGHTS
         sc_weights = np.empty((X.shape[0], Ytrain.shape[0]))
         if custom_donor_pool is None:
@@ -763,9 +985,15 @@ def _fit(
             w_pen=best_w_pen,
             custom_donor_pool=custom_donor_pool_t,
         )
-        sc_weights[control_units, :] = weights(
-            Xtrain, V=best_V, w_pen=best_w_pen, custom_donor_pool=custom_donor_pool_c
-        )
+        if compute_control_weights:
+            sc_weights[control_units, :] = weights(
+                Xtrain, V=best_V, w_pen=best_w_pen, custom_donor_pool=custom_donor_pool_c
+            )
+            unweighted_units = None
+        else:
+            # predict() falls back to the controls' own outcomes for these rows
+            sc_weights[control_units, :] = np.nan
+            unweighted_units = control_units
 
     else:
 
@@ -776,51 +1004,24 @@ def _fit(
             
         control_units = None
 
-        # --------------------------------------------------
-        # Phase 1: extract cross fold residual errors for each v_pen
-        # --------------------------------------------------
-
-        # SCORES FOR EACH VALUE OF THE GRID: very slow ( minutes to hours )
-        ret = CV_score(
-            X=X,
-            Y=Y,
-            splits=cv_folds,
-            v_pen=v_pen,
-            progress=progress,
-            w_pen=w_pen,
+        ret = _fit_core(
+            _compute(X),
+            _compute(Y),
             grad_splits=gradient_folds,
             random_state=gradient_seed,  # TODO: Cleanup Task 1
-            quiet=not progress,
-            batchDir=batchDir,
-            w_pen_inner=w_pen_inner,
+            **core_args,
             **kwargs
         )
         if not ret:
             # this happens when only a batch file is being produced but not executed
             return
-        scores, scores_se = ret
-
-        # GET THE INDEX OF THE BEST SCORE
-        best_v_pen, best_w_pen, score, which = _choose(scores, scores_se)
-
-        # --------------------------------------------------
-        # Phase 2: extract V and weights: slow ( tens of seconds to minutes )
-        # --------------------------------------------------
-
-        best_V = tensor(
-            X=X,
-            Y=Y,
-            w_pen=best_w_pen,
-            v_pen=best_v_pen,
-            grad_splits=gradient_folds,
-            random_state=gradient_seed,  # TODO: Cleanup Task 1
-            **kwargs
-        )
+        best_V, best_v_pen, best_w_pen, score, scores, which = ret
 
         # GET THE BEST SET OF WEIGHTS
         sc_weights = weights(
             X, V=best_V, w_pen=best_w_pen, custom_donor_pool=custom_donor_pool
         )
+        unweighted_units = None
 
     return SparseSCFit(
         features=X,
@@ -836,12 +1037,150 @@ def _fit(
         V=best_V,
         # Fitted Synthetic Controls
         sc_weights=sc_weights,
+        unweighted_units=unweighted_units,
         score=score,
         scores=scores,
         selected_score=which,
     )
 
 
+def _fit_core(
+    X,
+    Y,
+    v_pen,
+    w_pen,
+    choose,
+    cv_folds=10,
+    progress=True,
+    batchDir=None,
+    w_pen_inner=False,
+    n_jobs=-1,
+    early_stop=None,
+    warm_start=False,
+    recompute_final=False,
+    cache_dir=None,
+    fold_parallel=True,
+    **kwargs
+):
+    """ Phases 1 and 2 of the fit, shared by all model types: scores the
+    penalties by cross validation, picks one via ``choose(scores, scores_se)``
+    and fits V at the chosen penalties.
+
+    ``X`` and ``Y`` are the (already sliced) training data; ``X_treat`` /
+    ``Y_treat`` and the gradient folds (``grad_splits``, ``random_state``) are
+    passed through ``kwargs`` to :func:`CV_score` and :func:`tensor`.
+
+    Returns ``(V, v_pen, w_pen, score, scores, index)`` for the chosen
+    penalties, or ``None`` when only a batch file is produced.
+    """
+    # --------------------------------------------------
+    # Phase 1: extract cross fold residual errors for each v_pen
+    # --------------------------------------------------
+
+    # SCORES FOR EACH VALUE OF THE GRID: very slow ( minutes to hours )
+    ret = _cv_grid(
+        X=X,
+        Y=Y,
+        splits=cv_folds,
+        v_pen=v_pen,
+        w_pen=w_pen,
+        progress=progress,
+        quiet=not progress,
+        batchDir=batchDir,
+        w_pen_inner=w_pen_inner,
+        n_jobs=n_jobs,
+        early_stop=early_stop,
+        warm_start=warm_start,
+        cache_dir=cache_dir,
+        fold_parallel=fold_parallel,
+        **kwargs
+    )
+    if not ret:
+        # this happens when only a batch file is being produced but not executed
+        return None
+    scores, scores_se, v_mats = ret
+
+    # GET THE INDEX OF THE BEST SCORE
+    best_v_pen, best_w_pen, score, which = choose(scores, scores_se)
+
+    # --------------------------------------------------
+    # Phase 2: extract V and weights: slow ( tens of seconds to minutes )
+    # --------------------------------------------------
+    if v_mats is not None and not recompute_final:
+        best_V = v_mats[which]
+    else:
+        best_V = tensor(X=X, Y=Y, w_pen=best_w_pen, v_pen=best_v_pen, **kwargs)
+
+    return best_V, best_v_pen, best_w_pen, score, scores, which
+
+
+def _shuffled_folds(N, n_splits, seed):
+    """ Shuffled K-fold (train, test) splits of ``range(N)``
+
+    Like :class:`sklearn.model_selection.KFold` with ``shuffle=True``, but
+    shuffles with a :class:`numpy.random.Generator` seeded by ``seed``
+    instead of the legacy ``RandomState``.
+    """
+    if not 2 <= n_splits <= N:
+        raise ValueError(
+            "Cannot have number of splits n_splits=%s less than 2 or greater "
+            "than the number of units: N=%s." % (n_splits, N)
+        )
+    perm = np.random.default_rng(seed).permutation(N)
+    folds = []
+    for test in np.array_split(perm, n_splits):
+        test = np.sort(test)
+        in_train = np.ones(N, dtype=bool)
+        in_train[test] = False
+        folds.append((np.flatnonzero(in_train), test))
+    return folds
+
+
+def _prospective_folds(gradient_folds, treated_units, control_units, N):
+    """ Re-forms gradient folds for the ``"prospective"`` model type
+
+    The treated units are added to each training fold and removed from each
+    test fold (dropping folds left empty), and a final fold which predicts the
+    treated units from the control units is appended.  Folds are returned as
+    ``(train, test)`` tuples of ``np.intp`` index arrays.
+    """
+    treated_arr = np.asarray(treated_units, dtype=np.intp)
+    treated_mask = np.zeros(N, dtype=bool)
+    treated_mask[treated_arr] = True
+
+    folds = []
+    for train, test in gradient_folds:
+        train = np.unique(np.concatenate([np.asarray(train, dtype=np.intp), treated_arr]))
+        test = np.asarray(test, dtype=np.intp)
+        test = test[~treated_mask[test]]
+        if train.size and test.size:
+            folds.append((train, test))
+    folds.append((np.asarray(control_units, dtype=np.intp), treated_arr))
+    if __debug__:
+        assert all(
+            train.dtype == np.intp and test.dtype == np.intp for train, test in folds
+        )
+    return folds
+
+
+def _sc_predict(sc_weights, targets, control_units, out=None, unweighted_units=None):
+    """ Synthetic control predictions of ``targets``
+
+    The ``unweighted_units`` (i.e. the control units when
+    ``compute_control_weights=False``), whose rows of ``sc_weights`` were
+    never computed, are predicted by the unit's own outcomes.  If given, the
+    predictions are written to ``out``.
+    """
+    donors = targets if control_units is None else targets[control_units, :]
+    if unweighted_units is not None and len(unweighted_units):
+        sc_weights = sc_weights.copy()
+        sc_weights[unweighted_units, :] = 0
+    targets_sc = np.matmul(sc_weights, donors, out=out)
+    if unweighted_units is not None and len(unweighted_units):
+        targets_sc[unweighted_units, :] = targets[unweighted_units, :]
+    return targets_sc
+
+
 class SparseSCFit(object):
     """ 
     A class representing the results of a Synthetic Control model instance.
@@ -873,7 +1212,9 @@ class SparseSCFit(object):
         #For transformaions of X->M
         match_space_trans = None,
         match_space = None,
-        match_space_desc = None
+        match_space_desc = None,
+        # Units whose (NaN) rows of sc_weights were not computed
+        unweighted_units = None
     ):
         #If match_space===None then V is over match_space (rather than X) and look at match_space_desc for relation to X
 
@@ -896,6 +1237,7 @@ class SparseSCFit(object):
 
         # FITTED SYNTHETIC CONTROLS
         self._sc_weights = sc_weights
+        self.unweighted_units = unweighted_units
 
         # IDENTIFY TRIVIAL UNITS
         M=features
@@ -918,10 +1260,19 @@ class SparseSCFit(object):
         
         fit_units = _get_fit_units(model_type, control_units, treated_units, targets.shape[0])
         if targets_sc is None:
-            targets_sc = sc_weights.dot(targets[control_units, :])
+            targets_sc = _sc_predict(
+                sc_weights, targets, control_units, unweighted_units=unweighted_units
+            )
+            if unweighted_units is not None:
+                # units without weights (see compute_control_weights) are not scored
+                unweighted = set(unweighted_units)
+                fit_units = [u for u in fit_units if u not in unweighted]
         elif sc_weights is None:
             self.targets_sc = targets_sc
-        self.score_R2 = r2_score(targets[fit_units,:].flatten(), targets_sc[fit_units,:].flatten())
+        if len(fit_units):
+            self.score_R2 = r2_score(targets[fit_units,:].flatten(), targets_sc[fit_units,:].flatten())
+        else:
+            self.score_R2 = np.nan
 
     @property
     def sc_weights(self):
@@ -946,7 +1297,7 @@ class SparseSCFit(object):
         __weights[np.ix_(np.logical_not(self.trivial_units), trivial_donors)] = 0
         return __weights
 
-    def predict(self, targets=None, include_trivial_donors=True):
+    def predict(self, targets=None, include_trivial_donors=True, out=None):
         """ 
         predict method
 
@@ -960,6 +1311,11 @@ class SparseSCFit(object):
                 Default = ```False```
         :type include_trivial_donors: boolean
 
+        :param out: Array in which to place the predictions, e.g. to reuse one
+                buffer across repeated calls. Must have shape ``(N, targets.shape[1])``
+                and the dtype the result would have had.
+        :type out: (optional) array of floats
+
         :returns: matrix of predicted outcomes
         :rtype: matrix of floats
 
@@ -975,10 +1331,13 @@ class SparseSCFit(object):
                     "parameter targets must have the same number of rows as features and targets in the fitted model"
                 )
 
-        if self.model_type != "full":
-            targets = targets[self.control_units, :]
-
-        return self.get_weights(include_trivial_donors).dot(targets)
+        return _sc_predict(
+            self.get_weights(include_trivial_donors),
+            targets,
+            self.control_units if self.model_type != "full" else None,
+            out=out,
+            unweighted_units=self.unweighted_units,
+        )
 
     def __str__(self):
         """ 
@@ -988,7 +1347,13 @@ class SparseSCFit(object):
             self.model_type,
             self.fitted_v_pen,
             self.fitted_w_pen,
-            np.diag(self.V),
+            # a view of the diagonal, abbreviated when V is large (the null
+            # model stores a 1-d, empty V)
+            np.array2string(
+                np.einsum("ii->i", self.V) if np.ndim(self.V) == 2 else np.asarray(self.V),
+                threshold=16,
+                precision=4,
+            ),
         )
 
     def show(self):
@@ -1033,6 +1398,41 @@ V: %s
 """
 
 
+def _argmin_loop(a):
+    """
+    Index of the first minimum of a 1-d float64 array; like np.argmin, the
+    first NaN (if any) is the minimum
+    """
+    m = a[0]
+    if m != m:
+        return 0
+    k = 0
+    for i in range(1, a.shape[0]):
+        if a[i] != a[i]:
+            return i
+        if a[i] < m:
+            m = a[i]
+            k = i
+    return k
+
+
+@lru_cache(maxsize=None)
+def _argmin_f8():
+    """
+    :func:`_argmin_loop` compiled by Numba, or ``None`` when Numba is not
+    installed.  Numba is imported (and the loop compiled) on first use, so
+    that importing SparseSC does not load it.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        # Numba is an optional dependency
+        return None
+    # fastmath is deliberately not used: unscored grid points are given a
+    # score of inf (see _cv_path) which fastmath assumes away
+    return njit(cache=True)(_argmin_loop)
+
+
 def _which(x, se, f):
     """
     Return the index of the value which meets the selection rule
@@ -1041,6 +1441,14 @@ def _which(x, se, f):
     if callable(f):
         return f(x)
     if f == "min":
+        if (
+            isinstance(x, np.ndarray)
+            and x.ndim == 1
+            and x.dtype == np.float64
+            and x.size > 0
+            and _argmin_f8() is not None
+        ):
+            return _argmin_f8()(x)
         return np.argmin(x)
     if f == "1se":
         """
@@ -5,6 +5,7 @@ Implements cross-train gradient descent methods
 from numpy import ones, diag, zeros, absolute, mean, var, linalg, prod, sqrt
 import numpy as np
 from .utils.print_progress import print_progress
+from .utils.misc import _as_float
 from SparseSC.optimizers.cd_line_search import cdl_search
 
 
@@ -21,6 +22,7 @@ def ct_v_matrix(
     verbose=False,
     gradient_message="Calculating gradient",
     w_pen_inner=False,
+    compute_dtype=None,
     **kwargs
 ):
     """
@@ -64,6 +66,11 @@ def ct_v_matrix(
     :param gradient_message: Messaged prefixed to the progress bar when verbose = 1
     :type gradient_message: str
 
+    :param compute_dtype: If ``numpy.float32``, the fit is computed in single
+        precision (V itself remains float64).  Otherwise ``X`` and ``Y`` are
+        coerced to float64.
+    :type compute_dtype: numpy.float32, optional
+
     :param kwargs: additional arguments passed to the optimizer
 
     :raises ValueError: raised when parameter values are invalid
@@ -87,11 +94,11 @@ def ct_v_matrix(
     if set(treated_units).intersection(control_units):
         raise ValueError("Treated and Control units must be exclusive")
     try:
-        X = np.float64(X)
+        X = _as_float(X, compute_dtype)
     except ValueError:
         raise ValueError("X is not coercible to a numpy float64")
     try:
-        Y = np.float64(Y)
+        Y = _as_float(Y, compute_dtype)
     except ValueError:
         raise ValueError("Y is not coercible to a numpy float64")
     Y = np.asmatrix(Y) # this needs to be deprecated properly -- bc Array.dot(Array) != matrix(Array).dot(matrix(Array)) -- not even close !!!
@@ -109,7 +116,7 @@ def ct_v_matrix(
     if not isinstance(v_pen, (float, int)):
         raise TypeError("v_pen is not a number")
     if w_pen is None:
-        w_pen = mean(var(X, axis=0))
+        w_pen = float(mean(var(X, axis=0)))
     else:
         w_pen = float(w_pen)
     if not isinstance(w_pen, (float, int)):
@@ -169,9 +176,10 @@ def ct_v_matrix(
             dGamma0_dV_term2[k] = np.einsum("ij,kj,ki->", Ey, Y_control, dPI_dV)
         return v_pen + 2 * dGamma0_dV_term2
 
-    w_pen_mat = 2 * w_pen * diag(ones(X_control.shape[0]))
+    w_pen_mat = 2 * w_pen * diag(ones(X_control.shape[0], dtype=X.dtype))
 
     def _weights(V):
+        V = V.astype(X.dtype, copy=False)
         A = X_control.dot(2 * V).dot(X_control.T) + w_pen_mat  # 5
         B = (
             X_treated.dot(2 * V).dot(X_control.T).T + 2 * w_pen / X_control.shape[0]
@@ -186,7 +194,8 @@ def ct_v_matrix(
         return weights, A, B
 
     def _weights_varying(V, w_pen):
-        w_pen_mat = 2 * w_pen * diag(ones(X_control.shape[0]))
+        V = V.astype(X.dtype, copy=False)
+        w_pen_mat = 2 * w_pen * diag(ones(X_control.shape[0], dtype=X.dtype))
         A = X_control.dot(2 * V).dot(X_control.T) + w_pen_mat  # 5
         B = (
             X_treated.dot(2 * V).dot(X_control.T).T + 2 * w_pen / X_control.shape[0]
@@ -8,6 +8,7 @@ import itertools
 from .optimizers.cd_line_search import cdl_search
 from .utils.print_progress import print_progress
 from .utils.batch_gradient import single_grad
+from .utils.misc import _as_float
 
 _BATCH_GRADIENT_FILE = "grad_parameters.yml"
 
@@ -28,6 +29,7 @@ def fold_v_matrix(
     gradient_message="Calculating gradient",
     batch_client_config=None,
     w_pen_inner=False,
+    compute_dtype=None,
     **kwargs
 ):
     """
@@ -80,6 +82,11 @@ def fold_v_matrix(
     :param gradient_message: Messaged prefixed to the progress bar when verbose = 1
     :type gradient_message: str
 
+    :param compute_dtype: If ``numpy.float32``, the fit is computed in single
+        precision (V itself remains float64).  Otherwise ``X`` and ``Y`` are
+        coerced to float64.
+    :type compute_dtype: numpy.float32, optional
+
     :param kwargs: additional arguments passed to the optimizer
     :type kwargs:
 
@@ -108,11 +115,11 @@ def fold_v_matrix(
 
     # parameter QC
     try:
-        X = np.float64(X)
+        X = _as_float(X, compute_dtype)
     except ValueError:
         raise ValueError("X is not coercible to a numpy float64")
     try:
-        Y = np.float64(Y)
+        Y = _as_float(Y, compute_dtype)
     except ValueError:
         raise ValueError("Y is not coercible to a numpy float64")
 
@@ -133,7 +140,7 @@ def fold_v_matrix(
     if not isinstance(v_pen, (float, int)):
         raise TypeError("v_pen is not a number")
     if w_pen is None:
-        w_pen = mean(var(X, axis=0))
+        w_pen = float(mean(var(X, axis=0)))
     else:
         w_pen = float(w_pen)
     if not isinstance(w_pen, (float, int)):
@@ -217,7 +224,7 @@ def fold_v_matrix(
         weights, A, _ = _weights(dv)
         # Ey = (weights.T.dot(Y_control) - Y_treated).getA()
         dGamma0_dV_term2 = zeros(K)
-        dPI_dV = zeros((N0, N1))  # stupid notation: PI = W.T
+        dPI_dV = zeros((N0, N1), dtype=X.dtype)  # stupid notation: PI = W.T
         for k in range(K):
             if verbose:  # for large sample sizes, linalg.solve is a huge bottle neck,
                 print_progress(
@@ -336,8 +343,9 @@ def fold_v_matrix(
         _grad = _grad_daemon
 
     def _weights(V):
-        weights = zeros((N0, N1))
-        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0]))  # 5
+        V = V.astype(X.dtype, copy=False)
+        weights = zeros((N0, N1), dtype=X.dtype)
+        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0], dtype=X.dtype))  # 5
         B = X.dot(V + V.T).dot(X.T).T  # 6
         for i, (_, test) in enumerate(splits):
             if (
@@ -362,8 +370,9 @@ def fold_v_matrix(
         return weights, A, B
 
     def _weights_varying(V, w_pen):
-        weights = zeros((N0, N1))
-        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0]))  # 5
+        V = V.astype(X.dtype, copy=False)
+        weights = zeros((N0, N1), dtype=X.dtype)
+        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0], dtype=X.dtype))  # 5
         B = X.dot(V + V.T).dot(X.T).T  # 6
         for i, (_, test) in enumerate(splits):
             if (
@@ -9,6 +9,7 @@ import itertools
 # only used by the step-down method (currently not implemented):
 # from SparseSC.utils.sub_matrix_inverse import subinv_k, all_subinverses
 from .utils.print_progress import print_progress
+from .utils.misc import _as_float
 from SparseSC.optimizers.cd_line_search import cdl_search
 
 
@@ -46,6 +47,7 @@ def loo_v_matrix(
     verbose=False,
     gradient_message="Calculating gradient",
     w_pen_inner=False,
+    compute_dtype=None,
     **kwargs
 ):
     """
@@ -93,6 +95,11 @@ def loo_v_matrix(
     :param gradient_message: Messaged prefixed to the progress bar when verbose = 1
     :type gradient_message: str
 
+    :param compute_dtype: If ``numpy.float32``, the fit is computed in single
+        precision (V itself remains float64).  Otherwise ``X`` and ``Y`` are
+        coerced to float64.
+    :type compute_dtype: numpy.float32, optional
+
     :param kwargs: additional arguments passed to the optimizer
     :type kwargs:
 
@@ -110,11 +117,11 @@ def loo_v_matrix(
 
     # parameter QC
     try:
-        X = np.float64(X)
+        X = _as_float(X, compute_dtype)
     except ValueError:
         raise ValueError("X is not coercible to a numpy float64")
     try:
-        Y = np.float64(Y)
+        Y = _as_float(Y, compute_dtype)
     except ValueError:
         raise ValueError("Y is not coercible to a numpy float64")
     Y = np.asmatrix(Y) # this needs to be deprecated properly -- bc Array.dot(Array) != matrix(Array).dot(matrix(Array)) -- not even close !!!
@@ -132,7 +139,7 @@ def loo_v_matrix(
     if not isinstance(v_pen, (float, int)):
         raise TypeError("v_pen is not a number")
     if w_pen is None:
-        w_pen = mean(var(X, axis=0))
+        w_pen = float(mean(var(X, axis=0)))
     else:
         w_pen = float(w_pen)
     if not isinstance(w_pen, (float, int)):
@@ -204,7 +211,7 @@ def loo_v_matrix(
         weights, A, _ = _weights(dv)
         Ey = (weights.T.dot(Y_control) - Y_treated).getA()
         dGamma0_dV_term2 = zeros(K)
-        dPI_dV = zeros((N0, N1))  # stupid notation: PI = W.T
+        dPI_dV = zeros((N0, N1), dtype=X.dtype)  # stupid notation: PI = W.T
         # if solve_method == "step-down": Ai_cache = all_subinverses(A)
         for k in range(K):
             if verbose:  # for large sample sizes, linalg.solve is a huge bottle neck,
@@ -242,7 +249,8 @@ def loo_v_matrix(
         return v_pen + dGamma0_dV_term2
 
     def _weights(V):
-        weights = zeros((N0, N1))
+        V = V.astype(X.dtype, copy=False)
+        weights = zeros((N0, N1), dtype=X.dtype)
         if solve_method == "step-down":  # pylint: disable=no-else-raise
             raise NotImplementedError(
                 "The solve_method 'step-down' is currently not implemented"
@@ -259,7 +267,7 @@ def loo_v_matrix(
             #     b_i[i] = b
             #     weights[out_controls[i], i] = b.flatten()
         elif solve_method == "standard":
-            A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0]))  # 5
+            A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0], dtype=X.dtype))  # 5
             B = X.dot(V + V.T).dot(X.T).T  # 6
             for i, trt_unit in enumerate(treated_units):
                 if (
@@ -285,8 +293,9 @@ def loo_v_matrix(
         return weights, A, B
 
     def _weights_varying(V, w_pen):
-        weights = zeros((N0, N1))
-        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0]))  # 5
+        V = V.astype(X.dtype, copy=False)
+        weights = zeros((N0, N1), dtype=X.dtype)
+        A = X.dot(V + V.T).dot(X.T) + 2 * w_pen * diag(ones(X.shape[0], dtype=X.dtype))  # 5
         B = X.dot(V + V.T).dot(X.T).T  # 6
         for i, trt_unit in enumerate(treated_units):
             try:
@@ -5,18 +5,22 @@ from SparseSC.fit_fold import fold_v_matrix
 from SparseSC.fit_loo import loo_v_matrix
 from SparseSC.fit_ct import ct_v_matrix
 import numpy as np
+from SparseSC.utils.misc import _as_float
 
 
 def tensor(X, Y, X_treat=None, Y_treat=None, grad_splits=None, **kwargs):
     """ Presents a unified api for ct_v_matrix and loo_v_matrix
+
+    The inputs are coerced to float64, unless ``compute_dtype=numpy.float32``
+    is passed (see :func:`fold_v_matrix`).
     """
     # PARAMETER QC
     try:
-        X = np.float64(X)
+        X = _as_float(X, kwargs.get("compute_dtype"))
     except ValueError:
         raise ValueError("X is not coercible to float64")
     try:
-        Y = np.float64(Y)
+        Y = _as_float(Y, kwargs.get("compute_dtype"))
     except ValueError:
         raise ValueError("Y is not coercible to float64")
 
@@ -44,11 +48,11 @@ def tensor(X, Y, X_treat=None, Y_treat=None, grad_splits=None, **kwargs):
 
         # PARAMETER QC
         try:
-            X_treat = np.float64(X_treat)
+            X_treat = _as_float(X_treat, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("X_treat is not coercible to float64")
         try:
-            Y_treat = np.float64(Y_treat)
+            Y_treat = _as_float(Y_treat, kwargs.get("compute_dtype"))
         except ValueError:
             raise ValueError("Y_treat is not coercible to float64")
 
@@ -3,6 +3,8 @@
 import contextlib
 import sys
 
+import numpy as np
+
 
 @contextlib.contextmanager
 def capture():
@@ -58,6 +60,43 @@ class PreDemeanScaler:
         return (Y.T + self.means).T
 
 
+def _as_float(a, compute_dtype=None):
+    """
+    Coerces to a float64 array, or to a float32 array when ``compute_dtype``
+    is ``numpy.float32`` (so that the V fits can be computed in single
+    precision).  Other types of input are always promoted to float64.
+    """
+    if compute_dtype is not None and np.dtype(compute_dtype) == np.float32:
+        return np.asarray(a, dtype=np.float32)
+    return np.float64(a)
+
+
+def _check_compute_dtype(compute_dtype):
+    """
+    Validates the ``compute_dtype`` option: ``None`` or ``numpy.float32``
+    """
+    try:
+        if compute_dtype is None or np.dtype(compute_dtype) == np.float32:
+            return
+    except TypeError:
+        pass
+    raise ValueError(
+        "compute_dtype must be None or numpy.float32, not %r" % (compute_dtype,)
+    )
+
+
+def _take_rows(a, units):
+    """
+    Returns the rows ``units`` of ``a``.  When ``units`` is an ascending run of
+    consecutive integers this is a (read-only by convention) slice view
+    instead of a copy, so callers must not write to the result.
+    """
+    units = np.asarray(units, dtype=np.intp)
+    if units.size and (np.diff(units) == 1).all():
+        return a[units[0] : units[-1] + 1]
+    return a[units]
+
+
 def _ensure_good_donor_pool(custom_donor_pool, control_units):
     N0 = custom_donor_pool.shape[1]
     custom_donor_pool_c = custom_donor_pool[control_units, :]
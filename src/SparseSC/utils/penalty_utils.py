@@ -7,6 +7,8 @@ from SparseSC.fit_ct import ct_v_matrix
 from SparseSC.fit_fold import fold_v_matrix
 
 # from SparseSC.optimizers.cd_line_search import cdl_search
+from functools import lru_cache
+from hashlib import blake2b
 import numpy as np
 
 _GRADIENT_MESSAGE = "Calculating maximum covariate penalty (i.e. the gradient at zero)"
@@ -186,6 +188,73 @@ def get_max_v_pen(X, Y, w_pen=None, X_treat=None, Y_treat=None, **kwargs):
                 )  
 
 
+# ------------------------------------------------------------
+# memoized penalty heuristics, for repeated fits on identical data
+# ------------------------------------------------------------
+
+
+def _array_key(a):
+    """ A hashable digest of the shape, dtype and contents of an array
+    """
+    a = np.ascontiguousarray(a)
+    return (a.shape, a.dtype.str, blake2b(a.tobytes(), digest_size=16).digest())
+
+
+class _ArrayKey(object):
+    """ Wraps an array so it can be passed to a function cached with
+    :func:`functools.lru_cache`, comparing equal to any array with the same
+    contents.  The cached functions release the array once it has been used
+    so that the cache only holds on to the digests.
+    """
+
+    __slots__ = ("array", "key")
+
+    def __init__(self, array):
+        self.array = array
+        self.key = _array_key(array)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, _ArrayKey) and self.key == other.key
+
+    def pop(self):
+        """ returns the wrapped array, releasing the reference to it
+        """
+        array, self.array = self.array, None
+        return array
+
+
+@lru_cache(maxsize=32)
+def _w_pen_guestimate_memo(X):
+    return w_pen_guestimate(X.pop())
+
+
+@lru_cache(maxsize=32)
+def _get_max_v_pen_memo(X, Y, w_pen, grad_splits, verbose):
+    return get_max_v_pen(
+        X.pop(), Y.pop(), w_pen=w_pen, grad_splits=grad_splits, verbose=verbose
+    )
+
+
+def _cached_w_pen_guestimate(X):
+    """ Same as :func:`w_pen_guestimate`, but memoized on the contents of `X`
+    """
+    return _w_pen_guestimate_memo(_ArrayKey(X))
+
+
+def _cached_get_max_v_pen(X, Y, w_pen, grad_splits, verbose=False):
+    """ Same as :func:`get_max_v_pen` (when `X_treat` and `Y_treat` are not
+    provided), but memoized on the contents of `X` and `Y` and the remaining
+    parameters.  `grad_splits` must be hashable (e.g. an integer number of
+    splits).
+    """
+    return _get_max_v_pen_memo(
+        _ArrayKey(X), _ArrayKey(Y), w_pen, grad_splits, verbose
+    )
+
+
 def RidgeCVSolution(M, control_units, controls_as_goals, extra_goals, V, w_pens=None, separate=None):
     import scipy.linalg #superset of np.linalg and also optimized compiled
     from sklearn.linear_model import RidgeCV
@@ -98,20 +98,24 @@ class TestDGPs(unittest.TestCase):
         N = N1 + N0
         treated_units, control_units  = range(N1), range(N1, N)
         T0, T1 = 5, 2
-        T = T0 + T1 # unused
+        T = T0 + T1
         proto_sim = np.array([1, 2, 3, 4, 5] + [6,7], ndmin=2)
         proto_not = np.array([0, 2, 4, 6, 8] + [10, 12], ndmin=2)
         te = 2
         proto_tr = proto_sim + np.hstack((np.zeros((1, T0)), np.full((1, T1), te)))
-        Y1 = np.matmul(np.ones((N1, 1)), proto_tr)
-        Y0_sim = np.matmul(np.ones((N0_sim, 1)), proto_sim)
-        Y0_sim = Y0_sim + np.random.normal(0,0.1,Y0_sim.shape)
+        rng = np.random.default_rng(101101001)
+        Y = np.empty((N, T))
+        Y1, Y0_sim, Y0_not = Y[:N1], Y[N1:N1 + N0_sim], Y[N1 + N0_sim:]
+        Y1[:] = np.broadcast_to(proto_tr, Y1.shape)
+        rng.standard_normal(out=Y0_sim)
+        Y0_sim *= 0.1
+        Y0_sim += np.broadcast_to(proto_sim, Y0_sim.shape)
         #Y0_sim = Y0_sim + np.hstack((np.zeros((N0_sim,1)), 
         #                             np.random.normal(0,0.1,(N0_sim,1)),
         #                             np.zeros((N0_sim,T-2))))
-        Y0_not = np.matmul(np.ones((N0_not, 1)), proto_not)
-        Y0_not = Y0_not + np.random.normal(0,0.1,Y0_not.shape)
-        Y = np.vstack((Y1, Y0_sim, Y0_not))
+        rng.standard_normal(out=Y0_not)
+        Y0_not *= 0.1
+        Y0_not += np.broadcast_to(proto_not, Y0_not.shape)
 
         unit_treatment_periods = np.full((N), -1)
         unit_treatment_periods[0] = T0
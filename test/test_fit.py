@@ -18,6 +18,7 @@ Tests the fit methods
 # --------------------------------------------------------------------------------
 
 from __future__ import print_function  # for compatibility with python 2.7
+import os
 import sys
 import random
 import unittest
@@ -25,11 +26,22 @@ import warnings
 from scipy.optimize.linesearch import LineSearchWarning
 import numpy as np
 import traceback
+import threading
+import subprocess
+import tempfile
+from unittest import mock
 
 try:
     import SparseSC
-    from SparseSC.fit import fit
+    from SparseSC.fit import (
+        fit, _cv_grid, _cv_path, _which, _argmin_f8, _argmin_loop, _shuffled_folds,
+        _prospective_folds, SparseSCParameterWarning, SparseSCFit
+    )
     from SparseSC.fit_fast import fit_fast
+    from SparseSC.cross_validation import CV_score, _score_folds
+    from SparseSC.tensor import tensor
+    from SparseSC.utils import penalty_utils
+    from SparseSC.utils.misc import _take_rows
 except ImportError:
     raise RuntimeError("SparseSC is not installed. Use 'pip install -e .' or 'conda develop .' from repo root to install in dev mode")
 #import warnings
@@ -39,6 +51,22 @@ SparseSC.keras_reproducible() #for when I start testing for correctness
 
 # pylint: disable=missing-docstring
 
+# a cheap optimizer, for tests which check the plumbing rather than the fit
+FAST_OPTS = dict(print_path=False, min_iter=-1, tol=1, verbose=0)
+
+
+def random_data(N, K, T=3):
+    np.random.seed(101101001)
+    return np.random.rand(N, K), np.random.rand(N, T)
+
+
+def quiet_fit(X, Y, **kwargs):
+    """ fit() with FAST_OPTS, no progress and the warnings silenced """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return fit(X, Y, progress=False, **FAST_OPTS, **kwargs)
+
+
 class TestFitForErrors(unittest.TestCase):
     def setUp(self):
 
@@ -214,6 +242,581 @@ class TestFitForCorrectness(unittest.TestCase):
             print("V: %s. Treated diff: %s" % (np.diag(fit_res.V), treated_diff))
 
 
+class TestCVPath(unittest.TestCase):
+    """ Early stopping of the penalty path (_cv_path) """
+
+    def setUp(self):
+        # U-shaped cross validation curve with its minimum at v_pen = 4.
+        self.pens = np.arange(1.0, 9.0)
+        self.calls = []
+
+    def cv_score(self, v_pen, w_pen, **kwargs):  # pylint: disable=unused-argument
+        self.calls.append(v_pen)
+        return (v_pen - 4) ** 2, 0.5
+
+    def run_path(self, early_stop):
+        grid = [{"v_pen": p, "w_pen": 1.0} for p in self.pens]
+        return _cv_path(self.pens, grid, early_stop, False, self.cv_score)
+
+    def test_patience(self):
+        scores, scores_se, v_mats = self.run_path(2)
+        # scored from the largest penalty down, stopping 2 points past the minimum
+        self.assertEqual(self.calls, [8.0, 7.0, 6.0, 5.0, 4.0, 3.0, 2.0])
+        self.assertTrue(np.isinf(scores[0]) and np.isinf(scores_se[0]))
+        np.testing.assert_array_equal(scores[1:], (self.pens[1:] - 4) ** 2)
+        self.assertIsNone(v_mats)
+
+    def test_tol(self):
+        # 3 - 4 is within tol of the minimum, 2 - 4 is not
+        scores, _, _ = self.run_path((1, 1.5))
+        self.assertEqual(self.calls, [8.0, 7.0, 6.0, 5.0, 4.0, 3.0, 2.0])
+        self.assertTrue(np.isinf(scores[0]))
+        self.calls = []
+        scores, _, _ = self.run_path((1, 4.5))
+        self.assertEqual(self.calls, list(self.pens[::-1]))
+        self.assertFalse(np.isinf(scores).any())
+
+    def test_no_early_stop(self):
+        scores, _, _ = self.run_path(None)
+        self.assertEqual(len(self.calls), len(self.pens))
+        self.assertFalse(np.isinf(scores).any())
+
+    def test_unscored_never_chosen(self):
+        # the global minimum is at the smallest penalty, which is never reached
+        self.cv_score = lambda v_pen, w_pen, **kwargs: (
+            (v_pen - 4) ** 2 - 20 * (v_pen == 1),
+            0.5,
+        )
+        scores, scores_se, _ = self.run_path(1)
+        self.assertTrue(np.isinf(scores[:2]).all())
+        self.assertFalse(np.isinf(scores[2:]).any())
+        self.assertEqual(_which(scores, scores_se, "min"), 3)
+        self.assertNotIn(_which(scores, scores_se, "1se"), (0, 1))
+
+
+class TestCVGrid(unittest.TestCase):
+    """ Scoring the penalty grid one call per point (_cv_grid) agrees with a
+    single call to CV_score """
+
+    def setUp(self):
+        X, Y = random_data(30, 4)
+        self.v_pens = [0.001, 0.01, 0.1, 1.0]
+        self.kwargs = dict(X=X, Y=Y, w_pen=1.0, splits=3, grad_splits=3,
+                           random_state=10101, quiet=True, progress=False,
+                           **FAST_OPTS)
+
+    def scores(self, scorer, **kwargs):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return scorer(v_pen=self.v_pens, **self.kwargs, **kwargs)[:2]
+
+    def test_per_point_matches_single_call(self):
+        scores, scores_se = self.scores(CV_score)
+        for n_jobs in (1, 2):
+            grid_scores, grid_se = self.scores(_cv_grid, n_jobs=n_jobs)
+            np.testing.assert_allclose(grid_scores, scores)
+            np.testing.assert_allclose(grid_se, scores_se)
+
+    def test_w_pen_inner_is_scored_in_one_call(self):
+        # each v_pen starts from the w_pen re-estimated at the previous one
+        scores, _ = self.scores(CV_score, w_pen_inner=True)
+        with mock.patch.object(
+            sys.modules["SparseSC.fit"], "CV_score", wraps=CV_score
+        ) as cv_score:
+            grid_scores, _ = self.scores(_cv_grid, w_pen_inner=True)
+        self.assertEqual(cv_score.call_count, 1)
+        np.testing.assert_allclose(grid_scores, scores)
+
+    def test_w_pen_inner_path_rejected(self):
+        for path in (dict(early_stop=1), dict(warm_start=True)):
+            with self.assertRaises(ValueError):
+                quiet_fit(self.kwargs["X"], self.kwargs["Y"], model_type="full",
+                          grid_length=2, w_pen_inner=True, **path)
+
+
+class TestWarmStart(unittest.TestCase):
+    """ V matrices fit along the penalty path (warm_start / return_vs) """
+
+    def setUp(self):
+        self.X, self.Y = random_data(40, 6)
+        self.v_pens = [0.1, 10.0, 1.0]  # unsorted, and each gives a different V
+
+    def fit(self, **kwargs):
+        return quiet_fit(
+            self.X, self.Y, model_type="full", v_pen=self.v_pens, w_pen=1.0, **kwargs
+        )
+
+    def test_final_weights_use_path_v(self):
+        fit_module = sys.modules["SparseSC.fit"]
+        cv_path = fit_module._cv_path
+        paths = []
+
+        def _cv_path(*args, **kwargs):
+            paths.append(cv_path(*args, **kwargs))
+            return paths[-1]
+
+        with mock.patch.object(fit_module, "_cv_path", _cv_path), mock.patch.object(
+            fit_module, "weights", wraps=fit_module.weights
+        ) as weights, mock.patch.object(
+            fit_module, "tensor", wraps=fit_module.tensor
+        ) as refit:
+            res = self.fit(warm_start=True)
+        _, _, v_mats = paths[0]
+        self.assertIs(res.V, v_mats[res.selected_score])
+        self.assertIs(weights.call_args[1]["V"], res.V)
+        refit.assert_not_called()
+
+    def test_recompute_final_matches_cold_fit(self):
+        res = self.fit(warm_start=True, recompute_final=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cold = tensor(
+                X=self.X,
+                Y=self.Y,
+                v_pen=res.fitted_v_pen,
+                w_pen=res.fitted_w_pen,
+                grad_splits=10,
+                random_state=10101,
+                **FAST_OPTS
+            )
+        np.testing.assert_allclose(res.V, cold)
+
+    def test_return_vs_aligned_with_penalties(self):
+        kwargs = dict(grad_splits=5, random_state=10101, **FAST_OPTS)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            scores, _, v_mats = CV_score(
+                self.X,
+                self.Y,
+                v_pen=self.v_pens,
+                w_pen=1.0,
+                splits=3,
+                quiet=True,
+                progress=False,
+                return_vs=True,
+                **kwargs
+            )
+            self.assertEqual(len(scores), len(self.v_pens))
+            self.assertEqual(len(v_mats), len(self.v_pens))
+            for v_pen, v_mat in zip(self.v_pens, v_mats):
+                np.testing.assert_allclose(
+                    v_mat, tensor(self.X, self.Y, v_pen=v_pen, w_pen=1.0, **kwargs)
+                )
+
+
+class TestPenaltyCache(unittest.TestCase):
+    """ Memoization of the default penalties on the contents of the data """
+
+    def setUp(self):
+        self.X, self.Y = random_data(30, 5)
+        penalty_utils._w_pen_guestimate_memo.cache_clear()
+        penalty_utils._get_max_v_pen_memo.cache_clear()
+
+    @staticmethod
+    def fit(X, Y, **kwargs):
+        quiet_fit(X, Y, model_type="full", stopping_rule=1, grid_length=2, **kwargs)
+
+    @staticmethod
+    def cache_info():
+        info = penalty_utils._get_max_v_pen_memo.cache_info()
+        return info.hits, info.misses
+
+    def test_equal_contents_hit(self):
+        self.fit(self.X, self.Y)
+        self.assertEqual(self.cache_info(), (0, 1))
+        # new array objects with the same contents
+        self.fit(self.X.copy(), self.Y.copy())
+        self.assertEqual(self.cache_info(), (1, 1))
+
+    def test_changed_contents_miss(self):
+        self.fit(self.X, self.Y)
+        X = self.X.copy()
+        X[0, 0] += 1
+        self.fit(X, self.Y)
+        self.assertEqual(self.cache_info(), (0, 2))
+
+    def test_cache_penalties_false(self):
+        self.fit(self.X, self.Y, cache_penalties=False)
+        self.fit(self.X, self.Y, cache_penalties=False)
+        self.assertEqual(self.cache_info(), (0, 0))
+        self.assertEqual(penalty_utils._w_pen_guestimate_memo.cache_info().currsize, 0)
+
+
+class TestCacheDir(unittest.TestCase):
+    """ Cross validation scores memoized on disk (cache_dir) """
+
+    def setUp(self):
+        self.X, self.Y = random_data(30, 4)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def fit(self, **kwargs):
+        """ The fit, and the number of cross validations actually run """
+        with mock.patch.object(
+            sys.modules["SparseSC.cross_validation"],
+            "_score_folds",
+            wraps=sys.modules["SparseSC.cross_validation"]._score_folds,
+        ) as score_folds:
+            res = quiet_fit(self.X, self.Y, model_type="full", v_pen=[0.01, 1.0],
+                            w_pen=1.0, n_jobs=1, cache_dir=self.tmp.name, **kwargs)
+        return res, score_folds.call_count
+
+    def test_hit_and_miss(self):
+        first, calls = self.fit()
+        self.assertEqual(calls, 2)
+        repeat, calls = self.fit()
+        self.assertEqual(calls, 0)
+        np.testing.assert_array_equal(repeat.scores, first.scores)
+        _, calls = self.fit(gradient_seed=1)
+        self.assertEqual(calls, 2)
+
+    def test_versioned(self):
+        self.fit()
+        self.assertEqual(os.listdir(self.tmp.name), [SparseSC.__version__])
+
+
+class TestWhichMin(unittest.TestCase):
+    """ The 'min' choice rule agrees with np.argmin, with or without Numba """
+
+    cases = [
+        [3.0, 1.0, 2.0],
+        [1.0, 1.0, 0.5, 0.5],
+        [3.0, np.nan, 1.0, 2.0],
+        [np.nan, 1.0],
+        [1.0, 2.0, np.nan, np.nan],
+        [np.inf, 3.0, np.inf, 2.0],
+        [np.inf, np.inf],
+        [-np.inf, 1.0, -np.inf],
+        [np.inf, np.nan, -np.inf],
+        [5.0],
+    ]
+
+    def test_which(self):
+        for case in self.cases:
+            x = np.array(case)
+            self.assertEqual(_which(x, None, "min"), np.argmin(x), case)
+
+    @unittest.skipIf(_argmin_f8() is None, "Numba is not installed")
+    def test_argmin_f8(self):
+        for case in self.cases:
+            x = np.array(case)
+            self.assertEqual(_argmin_f8()(x), np.argmin(x), case)
+
+    def test_argmin_loop(self):
+        for case in self.cases:
+            x = np.array(case)
+            self.assertEqual(_argmin_loop(x), np.argmin(x), case)
+
+    def test_import_does_not_load_numba(self):
+        code = "import sys, SparseSC.fit; print('numba' in sys.modules)"
+        # the child imports this SparseSC, whether or not it is installed
+        src = os.path.dirname(os.path.dirname(SparseSC.__file__))
+        env = dict(os.environ, PYTHONPATH=src)
+        out = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True,
+            text=True, env=env,
+        ).stdout
+        self.assertEqual(out.strip().splitlines()[-1], "False")
+
+
+class TestComputeDtype(unittest.TestCase):
+    def test_float32_close_to_float64(self):
+        X, Y = random_data(30, 4)
+        Y = Y + X[:, :3]  # so that V is not all zeros
+        for model_type in ("retrospective", "prospective", "prospective-restricted", "full"):
+            kwargs = dict(model_type=model_type, v_pen=[1e-4, 1e-3], w_pen=0.1,
+                          cv_folds=3, gradient_folds=3)
+            if model_type != "full":
+                kwargs["treated_units"] = np.arange(8)
+            f64 = quiet_fit(X, Y, **kwargs)
+            with mock.patch.object(
+                sys.modules["SparseSC.fit"], "tensor", wraps=tensor
+            ) as _tensor:
+                f32 = quiet_fit(X, Y, compute_dtype=np.float32, **kwargs)
+            # V is fit in single precision
+            self.assertEqual(_tensor.call_args[1]["X"].dtype, np.float32)
+            self.assertTrue(np.diag(f64.V).any(), model_type)
+            for attr in ("V", "sc_weights", "scores"):
+                self.assertEqual(np.asarray(getattr(f32, attr)).dtype, np.float64)
+                np.testing.assert_allclose(
+                    getattr(f32, attr), getattr(f64, attr), rtol=1e-4, atol=1e-7,
+                    err_msg="%s %s" % (model_type, attr),
+                )
+
+    def test_invalid_compute_dtype(self):
+        X, Y = np.random.rand(20, 3), np.random.rand(20, 2)
+        for compute_dtype in (np.float16, np.float64, int, "bogus"):
+            with self.assertRaises(ValueError):
+                fit(X, Y, model_type="full", v_pen=1.0, w_pen=1.0,
+                    compute_dtype=compute_dtype, progress=False)
+
+
+class TestControlWeights(unittest.TestCase):
+    """ compute_control_weights=False leaves the control rows of sc_weights NaN """
+
+    def setUp(self):
+        self.X, self.Y = random_data(30, 4)
+        self.treated_units = np.arange(10)
+        self.control_units = np.arange(10, 30)
+
+    def fit(self, **kwargs):
+        return quiet_fit(self.X, self.Y, treated_units=self.treated_units,
+                         model_type="retrospective", v_pen=1.0, w_pen=1.0, **kwargs)
+
+    def test_nan_control_rows(self):
+        full = self.fit()
+        res = self.fit(compute_control_weights=False)
+        self.assertTrue(np.isnan(res.sc_weights[self.control_units]).all())
+        np.testing.assert_allclose(
+            res.sc_weights[self.treated_units], full.sc_weights[self.treated_units]
+        )
+
+        np.testing.assert_array_equal(res.unweighted_units, self.control_units)
+        self.assertIsNone(full.unweighted_units)
+
+        pred = res.predict()
+        np.testing.assert_array_equal(pred[self.control_units], self.Y[self.control_units])
+        np.testing.assert_allclose(
+            pred[self.treated_units], full.predict()[self.treated_units]
+        )
+
+        out = np.empty_like(self.Y)
+        self.assertIs(res.predict(out=out), out)
+        np.testing.assert_array_equal(out, pred)
+
+    def test_score_r2_skips_nan_rows(self):
+        sc_weights = np.full((30, 20), np.nan)
+        sc_weights[self.treated_units] = np.random.dirichlet(np.ones(20), 10)
+        res = SparseSCFit(
+            features=self.X,
+            targets=self.Y,
+            control_units=self.control_units,
+            treated_units=self.treated_units,
+            model_type="prospective",
+            V=np.eye(4),
+            sc_weights=sc_weights,
+            unweighted_units=self.control_units,
+        )
+        Y_sc = sc_weights[self.treated_units].dot(self.Y[self.control_units])
+        expected = 1 - ((self.Y[self.treated_units] - Y_sc) ** 2).sum() / (
+            (self.Y[self.treated_units] - self.Y[self.treated_units].mean()) ** 2
+        ).sum()
+        self.assertAlmostEqual(res.score_R2, expected)
+
+
+    def test_other_nan_rows_stay_nan(self):
+        # NaN weights which were not skipped (e.g. a failed solve) are not
+        # papered over with the unit's own outcomes
+        def fit_with_nan_rows(rows):
+            sc_weights = np.random.dirichlet(np.ones(20), 30)
+            sc_weights[rows] = np.nan
+            return SparseSCFit(
+                features=self.X,
+                targets=self.Y,
+                control_units=self.control_units,
+                treated_units=self.treated_units,
+                model_type="retrospective",
+                V=np.eye(4),
+                sc_weights=sc_weights,
+            )
+
+        res = fit_with_nan_rows([0, 5])
+        nan_rows = np.isnan(res.predict()).all(axis=1)
+        np.testing.assert_array_equal(np.flatnonzero(nan_rows), [0, 5])
+        # a NaN prediction of a fit unit cannot be scored
+        with self.assertRaises(ValueError):
+            fit_with_nan_rows([15])
+
+
+class TestTakeRows(unittest.TestCase):
+    def setUp(self):
+        self.a = np.arange(20.0).reshape(10, 2)
+
+    def check(self, units, is_view):
+        rows = _take_rows(self.a, units)
+        np.testing.assert_array_equal(rows, self.a[list(units)])
+        self.assertEqual(np.shares_memory(rows, self.a), is_view)
+
+    def test_contiguous_ascending_is_view(self):
+        self.check([2, 3, 4], True)
+        self.check(np.arange(4, 10), True)
+        self.check(range(0, 10), True)
+
+    def test_single_unit_is_view(self):
+        self.check([7], True)
+
+    def test_unordered_contiguous_is_copy(self):
+        # a view would reorder the rows
+        self.check([4, 2, 3], False)
+
+    def test_gaps_are_copied(self):
+        self.check([1, 3, 4], False)
+        self.check([0, 9], False)
+
+
+class TestScoreFolds(unittest.TestCase):
+    """ Thread-parallel scoring of the cross validation folds """
+
+    splits = [(np.arange(i), np.array([i])) for i in range(1, 5)]
+
+    @staticmethod
+    def score(train, test, FoldNumber, **kwargs):  # pylint: disable=unused-argument
+        return FoldNumber, threading.current_thread().name
+
+    def test_fold_order(self):
+        results = _score_folds(self.score, self.splits, True, 2)
+        self.assertEqual([fold for fold, _ in results], [0, 1, 2, 3])
+
+    def test_single_job_is_sequential(self):
+        main = threading.current_thread().name
+        cross_validation = sys.modules["SparseSC.cross_validation"]
+        for n_jobs in (None, 1):
+            with mock.patch.object(cross_validation, "threadpool_limits") as limits:
+                results = _score_folds(self.score, self.splits, True, n_jobs)
+            # BLAS keeps all its threads
+            limits.assert_not_called()
+            self.assertEqual([fold for fold, _ in results], [0, 1, 2, 3])
+            self.assertTrue(all(name == main for _, name in results))
+
+    def test_batch_client_config_is_sequential(self):
+        main = threading.current_thread().name
+        results = _score_folds(
+            self.score, self.splits, True, 2, batch_client_config="sg_daemon"
+        )
+        self.assertTrue(all(name == main for _, name in results))
+
+
+class TestShuffledFolds(unittest.TestCase):
+    """ Default gradient folds for model_type="prospective" """
+
+    def test_partition(self):
+        N = 23
+        folds = _shuffled_folds(N, 5, 10101)
+        self.assertEqual(len(folds), 5)
+        tests = np.concatenate([test for _, test in folds])
+        np.testing.assert_array_equal(np.sort(tests), np.arange(N))
+        for train, test in folds:
+            np.testing.assert_array_equal(np.union1d(train, test), np.arange(N))
+            self.assertEqual(np.intersect1d(train, test).size, 0)
+
+    def test_sizes_match_kfold(self):
+        from sklearn.model_selection import KFold
+
+        for N, n_splits in ((23, 5), (10, 10), (100, 7)):
+            kfold = KFold(n_splits).split(np.arange(N))
+            self.assertEqual(
+                [(len(train), len(test)) for train, test in _shuffled_folds(N, n_splits, 1)],
+                [(len(train), len(test)) for train, test in kfold],
+            )
+
+    def test_seed(self):
+        def as_lists(folds):
+            return [(train.tolist(), test.tolist()) for train, test in folds]
+
+        self.assertEqual(
+            as_lists(_shuffled_folds(50, 5, 10101)), as_lists(_shuffled_folds(50, 5, 10101))
+        )
+        self.assertNotEqual(
+            as_lists(_shuffled_folds(50, 5, 10101)), as_lists(_shuffled_folds(50, 5, 10102))
+        )
+
+    def test_invalid_n_splits(self):
+        for n_splits in (0, 1, 11):
+            with self.assertRaises(ValueError):
+                _shuffled_folds(10, n_splits, 10101)
+
+
+class TestProspectiveFolds(unittest.TestCase):
+    """ Gradient folds for model_type="prospective" """
+
+    def setUp(self):
+        self.X, self.Y = random_data(12, 3)
+        self.treated_units = [5, 1]
+        self.control_units = [0, 2, 3, 4, 6, 7, 8, 9, 10, 11]
+        self.folds = [
+            ([0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]),
+            ([6, 7, 8, 9, 10, 11], [0, 1, 2, 3, 4, 5]),
+            ([0, 2, 3, 4, 6, 7, 8, 9, 10, 11], [1, 5]),
+        ]
+
+    @staticmethod
+    def as_lists(folds):
+        return [(list(train), list(test)) for train, test in folds]
+
+    def test_reformed(self):
+        folds = _prospective_folds(self.folds, self.treated_units, self.control_units, 12)
+        self.assertEqual(
+            self.as_lists(folds),
+            [
+                # treated units added to train and removed from test
+                ([0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]),
+                ([1, 5, 6, 7, 8, 9, 10, 11], [0, 2, 3, 4]),
+                # the third fold's test is left empty and dropped;
+                # control -> treated is appended
+                (self.control_units, [5, 1]),
+            ],
+        )
+        for train, test in folds:
+            self.assertEqual(train.dtype, np.intp)
+            self.assertEqual(test.dtype, np.intp)
+
+    def fit_folds(self, gradient_folds):
+        """ The gradient folds fit() passes on, and the warnings raised """
+        fit_module = sys.modules["SparseSC.fit"]
+        with warnings.catch_warnings(record=True) as caught, mock.patch.object(
+            fit_module, "_fit_core", wraps=fit_module._fit_core
+        ) as fit_core:
+            warnings.simplefilter("always")
+            fit(self.X, self.Y, treated_units=self.treated_units,
+                model_type="prospective", v_pen=1.0, w_pen=1.0,
+                gradient_folds=gradient_folds, progress=False, **FAST_OPTS)
+        reformed = [
+            w for w in caught if issubclass(w.category, SparseSCParameterWarning)
+        ]
+        return fit_core.call_args[1]["grad_splits"], reformed
+
+    def test_user_folds_with_treated_fold(self):
+        # the treated fold may list the treated units in any order
+        folds = self.folds[:2] + [(self.control_units, [1, 5])]
+        grad_splits, reformed = self.fit_folds(folds)
+        self.assertEqual(reformed, [])
+        self.assertEqual(self.as_lists(grad_splits), self.as_lists(folds))
+
+    def test_user_folds_without_treated_fold(self):
+        grad_splits, reformed = self.fit_folds(self.folds[:2])
+        self.assertEqual(len(reformed), 1)
+        self.assertEqual(
+            self.as_lists(grad_splits),
+            self.as_lists(
+                _prospective_folds(
+                    self.folds[:2], self.treated_units, self.control_units, 12
+                )
+            ),
+        )
+
+
+class TestFitStr(unittest.TestCase):
+    def test_null_model(self):
+        Y = np.random.rand(10, 2)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            res = fit(np.zeros((10, 0)), Y, treated_units=[0, 1])
+        self.assertIn("V: []", str(res))
+
+    def test_large_v_is_abbreviated(self):
+        np.random.seed(101101001)
+        res = SparseSCFit(
+            features=np.random.rand(5, 40),
+            targets=np.random.rand(5, 2),
+            control_units=None,
+            treated_units=None,
+            model_type="full",
+            V=np.diag(np.arange(1.0, 41.0)),
+            sc_weights=np.full((5, 5), 0.2),
+        )
+        self.assertIn("V: [ 1.  2.  3. ... 38. 39. 40.]", str(res))
+
+
 if __name__ == "__main__":
     t = TestFitForErrors()
     t.setUp()